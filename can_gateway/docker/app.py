@@ -5,14 +5,35 @@ Flask application with scheduled MQTT publishing to AWS IoT Core
 - Runs as a containerized service
 """
 
+import hashlib
 import json
+import queue
+import sys
 import time
 import threading
+from collections import deque
+from concurrent.futures import Future
 from pathlib import Path
-from flask import Flask, jsonify, request
+
+import orjson
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from basic_mqtt_client import CANGatewayMQTTClient
 
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (C encoder/decoder) instead of stdlib json"""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SORT_KEYS if kwargs.get('sort_keys', self.sort_keys) else 0
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 # Global client instance
 mqtt_client = None
@@ -20,14 +41,97 @@ config = None
 publisher_thread = None
 stop_event = threading.Event()
 
+# All publishes go through this queue to a single writer thread
+publish_queue = queue.SimpleQueue()
+writer_thread = None
+PUBLISH_TIMEOUT_SECONDS = 10
+
+# Sub-second sample intervals: sleep on the event until this close to the
+# deadline, then yield the CPU for the remainder
+SPIN_THRESHOLD_SECONDS = 0.01
+SPIN_WAKE_EARLY_SECONDS = 0.005
+
+# Scheduled telemetry topic and payload template (built once in load_config)
+telemetry_topic = None
+telemetry_prefix = b'{"timestamp":'
+telemetry_suffix = None
+
+# Samples waiting to be published in the next batch (bounded, oldest dropped first)
+telemetry_buffer = None
+
+# Invariant part of the manual publish payload (built once in load_config)
+manual_payload_static = None
+
+# Pre-serialized (body, ETag) for /config, and for /health keyed by MQTT connectivity
+config_response = None
+health_responses = None
+
+def cached_json(obj) -> tuple:
+    """Serialize a response body once and derive its ETag"""
+    body = orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return body, hashlib.blake2b(body, digest_size=8).hexdigest()
+
+def cached_response(cached: tuple) -> Response:
+    """Build a response from a pre-serialized body, answering 304 if the client's ETag matches"""
+    body, etag = cached
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
 def load_config():
     """Load configuration from config.json"""
-    global config
+    global config, telemetry_topic, telemetry_suffix, telemetry_buffer
+    global manual_payload_static, config_response, health_responses
     with open('config.json', 'r') as f:
         config = json.load(f)
     # Set default publish interval if not specified (5 minutes)
     if 'publish_interval_seconds' not in config:
         config['publish_interval_seconds'] = 300
+    # Sample at the publish interval unless configured faster (one sample per publish)
+    if 'sample_interval_seconds' not in config:
+        config['sample_interval_seconds'] = config['publish_interval_seconds']
+    # Publish early once this many samples are pending
+    if 'flush_threshold' not in config:
+        config['flush_threshold'] = 100
+
+    # Scheduled telemetry only changes its timestamp, so serialize the rest once
+    thing_name = config.get('thing_name', 'can-gateway')
+    telemetry_topic = f"vehicle/{thing_name}/telemetry"
+    telemetry_suffix = (
+        f',"gateway_id":{json.dumps(thing_name)},'
+        '"status":"online","message":"Scheduled telemetry data"}'
+    ).encode('utf-8')
+    telemetry_buffer = deque(maxlen=max(config['flush_threshold'], 1) * 10)
+
+    # Everything else derived from config is fixed after startup too
+    manual_payload_static = {
+        'gateway_id': thing_name,
+        'status': 'online',
+        'message': 'Manual publish'
+    }
+    health_config_view = {
+        'endpoint': config.get('endpoint', 'N/A'),
+        'thing_name': config.get('thing_name', 'N/A'),
+        'publish_interval_seconds': config['publish_interval_seconds']
+    }
+    config_view = {
+        'endpoint': config.get('endpoint', 'N/A'),
+        'thing_name': config.get('thing_name', 'N/A'),
+        'client_id': config.get('client_id', 'N/A'),
+        'publish_interval_seconds': config['publish_interval_seconds']
+    }
+
+    # /config never changes and /health only flips with MQTT connectivity,
+    # so serialize every possible body now
+    config_response = cached_json(config_view)
+    health_responses = {
+        connected: cached_json({
+            'status': 'healthy',
+            'mqtt_connected': connected,
+            'config': health_config_view
+        })
+        for connected in (True, False)
+    }
     return config
 
 def initialize_mqtt():
@@ -35,6 +139,7 @@ def initialize_mqtt():
     global mqtt_client
     try:
         mqtt_client = CANGatewayMQTTClient('config.json')
+        mqtt_client.configure_fast_publish(telemetry_topic, qos=1)
         if mqtt_client.connect():
             app.logger.info("MQTT client connected successfully")
             return True
@@ -42,59 +147,132 @@ def initialize_mqtt():
             app.logger.error("Failed to connect MQTT client")
             return False
     except Exception as e:
-        app.logger.error(f"Error initializing MQTT client: {e}")
+        app.logger.error("Error initializing MQTT client: %s", e)
         return False
 
+def enqueue_publish(topic, message) -> Future:
+    """
+    Queue a pre-serialized message for the writer thread
+
+    A topic of None sends the message down the client's fast path
+    (the scheduled telemetry topic). The returned future resolves to success.
+    """
+    future = Future()
+    publish_queue.put((topic, message, future))
+    return future
+
+def publish_writer_loop():
+    """Single writer thread - the only thread that publishes through mqtt_client"""
+    while True:
+        item = publish_queue.get()
+        if item is None:  # Shutdown sentinel
+            break
+        topic, message, future = item
+        try:
+            if topic is None:
+                future.set_result(mqtt_client.fast_publish(message))
+            else:
+                future.set_result(mqtt_client.publish_bytes(topic, message, qos=1))
+        except Exception as e:
+            future.set_exception(e)
+
+def record_telemetry():
+    """Buffer one telemetry sample, publishing early if the batch is full"""
+    telemetry_buffer.append(telemetry_prefix + repr(time.time()).encode('ascii') + telemetry_suffix)
+    if len(telemetry_buffer) >= config['flush_threshold']:
+        publish_telemetry()
+
 def publish_telemetry():
-    """Publish telemetry data to AWS IoT Core"""
+    """Publish buffered telemetry samples to AWS IoT Core as one message"""
     if mqtt_client and mqtt_client.is_connected:
-        payload = {
-            'timestamp': time.time(),
-            'gateway_id': config.get('thing_name', 'can-gateway'),
-            'status': 'online',
-            'message': 'Scheduled telemetry data'
-        }
+        samples = [telemetry_buffer.popleft() for _ in range(len(telemetry_buffer))]
+        if not samples:
+            return True
 
-        topic = f"vehicle/{config.get('thing_name', 'can-gateway')}/telemetry"
-        success = mqtt_client.publish(topic, payload, qos=1)
+        # Keep one payload shape per topic: with one sample per publish
+        # interval (the legacy setup) samples go out plain, one message each;
+        # when sampling faster they always go out as {"batch": [...]}, even
+        # if only one sample is pending
+        if config['sample_interval_seconds'] == config['publish_interval_seconds']:
+            messages = [bytearray(sample) for sample in samples]
+        else:
+            message = bytearray(b'{"batch":[')
+            message += b','.join(samples)
+            message += b']}'
+            messages = [message]
+        futures = [enqueue_publish(None, message) for message in messages]
+        results = [future.result(timeout=PUBLISH_TIMEOUT_SECONDS) for future in futures]
+        success = all(results)
 
         if success:
-            app.logger.info(f"Published to {topic}: {payload}")
+            app.logger.info("Published %d sample(s) to %s", len(samples), telemetry_topic)
             return True
         else:
-            app.logger.error(f"Failed to publish to {topic}")
+            app.logger.error("Failed to publish to %s", telemetry_topic)
             return False
     else:
-        app.logger.warning("MQTT client not connected, skipping publish")
+        app.logger.warning("MQTT client not connected, keeping samples for next publish")
         return False
 
+def wait_until(deadline):
+    """
+    Wait for a monotonic deadline with ~1ms precision, returning early on stop
+
+    Concept: Event.wait overshoots short timeouts by the OS timer
+    granularity. Sleep on the event until just before the deadline, then
+    yield (time.sleep(0)) through the last few milliseconds instead of
+    paying another timed futex wait.
+
+    Args:
+        deadline: time.monotonic() value to wait for
+    """
+    while not stop_event.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        if remaining > SPIN_THRESHOLD_SECONDS:
+            stop_event.wait(remaining - SPIN_WAKE_EARLY_SECONDS)
+        else:
+            time.sleep(0)
+
 def publisher_loop():
-    """Background thread that publishes telemetry at configured intervals"""
-    app.logger.info(f"Publisher thread started with interval: {config['publish_interval_seconds']}s")
+    """Background thread that samples and publishes telemetry at configured intervals"""
+    interval = config['sample_interval_seconds']
+    publish_interval = config['publish_interval_seconds']
+    app.logger.info("Publisher thread started with interval: %ss (sampling every %ss)", publish_interval, interval)
+    # Sub-second sampling needs tighter wakeups than Event.wait gives
+    fast_path = interval < 1.0
 
+    # Schedule against a monotonic deadline so publish time doesn't add drift
+    deadline = next_publish = time.monotonic()
     while not stop_event.is_set():
+        deadline += interval
         try:
-            publish_telemetry()
+            record_telemetry()
+            now = time.monotonic()
+            if now >= next_publish:
+                next_publish = max(next_publish + publish_interval, now)
+                publish_telemetry()
         except Exception as e:
-            app.logger.error(f"Error in publisher loop: {e}")
+            app.logger.error("Error in publisher loop: %s", e)
 
-        # Wait for the configured interval or until stop event
-        stop_event.wait(timeout=config['publish_interval_seconds'])
+        # Wait until the next deadline or until stop event
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            if fast_path:
+                wait_until(deadline)
+            else:
+                stop_event.wait(timeout=remaining)
+        else:
+            # Fell behind (slow publish) - restart the schedule instead of bursting
+            deadline = time.monotonic()
 
     app.logger.info("Publisher thread stopped")
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'mqtt_connected': mqtt_client.is_connected if mqtt_client else False,
-        'config': {
-            'endpoint': config.get('endpoint', 'N/A'),
-            'thing_name': config.get('thing_name', 'N/A'),
-            'publish_interval_seconds': config.get('publish_interval_seconds', 300)
-        }
-    }), 200
+    return cached_response(health_responses[bool(mqtt_client and mqtt_client.is_connected)])
 
 @app.route('/publish', methods=['POST'])
 def manual_publish():
@@ -105,15 +283,10 @@ def manual_publish():
             payload = request.json
             payload['timestamp'] = time.time()
         else:
-            payload = {
-                'timestamp': time.time(),
-                'gateway_id': config.get('thing_name', 'can-gateway'),
-                'status': 'online',
-                'message': 'Manual publish'
-            }
+            payload = {'timestamp': time.time(), **manual_payload_static}
 
-        topic = f"vehicle/{config.get('thing_name', 'can-gateway')}/telemetry"
-        success = mqtt_client.publish(topic, payload, qos=1)
+        topic = telemetry_topic
+        success = enqueue_publish(topic, orjson.dumps(payload)).result(timeout=PUBLISH_TIMEOUT_SECONDS)
 
         if success:
             return jsonify({
@@ -135,16 +308,13 @@ def manual_publish():
 @app.route('/config', methods=['GET'])
 def get_config():
     """Get current configuration"""
-    return jsonify({
-        'endpoint': config.get('endpoint', 'N/A'),
-        'thing_name': config.get('thing_name', 'N/A'),
-        'client_id': config.get('client_id', 'N/A'),
-        'publish_interval_seconds': config.get('publish_interval_seconds', 300)
-    }), 200
+    return cached_response(config_response)
 
 def start_publisher_thread():
-    """Start the background publisher thread"""
-    global publisher_thread
+    """Start the background writer and publisher threads"""
+    global publisher_thread, writer_thread
+    writer_thread = threading.Thread(target=publish_writer_loop, daemon=True)
+    writer_thread.start()
     publisher_thread = threading.Thread(target=publisher_loop, daemon=True)
     publisher_thread.start()
 
@@ -154,24 +324,47 @@ def shutdown():
     stop_event.set()
     if publisher_thread:
         publisher_thread.join(timeout=5)
+    if writer_thread:
+        publish_queue.put(None)
+        writer_thread.join(timeout=5)
     if mqtt_client:
         mqtt_client.disconnect()
     app.logger.info("Shutdown complete")
 
-if __name__ == '__main__':
+def create_app():
+    """
+    Load configuration, connect MQTT and start the background threads
+
+    Shared startup path for the WSGI entry point (wsgi.py) and the
+    development server below, so every request handler uses the one
+    MQTT client created here.
+
+    Raises:
+        RuntimeError: If the MQTT client fails to connect
+    """
     # Load configuration
     load_config()
 
     # Initialize MQTT client
     if not initialize_mqtt():
-        app.logger.error("Failed to initialize MQTT client, exiting...")
-        exit(1)
+        raise RuntimeError("Failed to initialize MQTT client")
 
     # Start publisher thread
     start_publisher_thread()
+    return app
 
-    # Run Flask app
+if __name__ == '__main__':
+    exit_code = 0
     try:
+        create_app()
+        # Run Flask development server (the container runs wsgi.py under gunicorn)
         app.run(host='0.0.0.0', port=5000, debug=False)
+    except RuntimeError as e:
+        app.logger.error("%s, exiting...", e)
+        exit_code = 1
     except KeyboardInterrupt:
+        pass
+    finally:
+        # Single cleanup path for normal exit, Ctrl+C and failed startup
         shutdown()
+    sys.exit(exit_code)
@@ -11,13 +11,23 @@ SETUP:
 """
 
 import json
+import os
+import socket
+import sys
+import threading
 import time
+import traceback
 from pathlib import Path
+
+import orjson
 from AWSIoTPythonSDK.MQTTLib import AWSIoTMQTTClient
 
 # Get the script's directory for resolving relative paths
 SCRIPT_DIR = Path(__file__).parent.resolve()
 
+# Print full tracebacks on errors (set MQTT_DEBUG=1)
+_DEBUG = os.getenv('MQTT_DEBUG') == '1'
+
 class CANGatewayMQTTClient:
     """Manages MQTT connection to AWS IoT Core"""
     
@@ -58,23 +68,46 @@ class CANGatewayMQTTClient:
             baseReconnectQuietTimeSecond=1
         )
         self.mqtt_client.configureOfflinePublishQueueing(-1)  # Unlimited queue
-        self.mqtt_client.configureDrainingFrequency(2)  # Drain queue every 2s
+        self.mqtt_client.configureDrainingFrequency(10)  # Drain queued requests at 10/s
         
         # Register callbacks
         self.mqtt_client.onOnlineCallback = self._on_online
         self.mqtt_client.onOfflineCallback = self._on_offline
         
         self.is_connected = False
+        self._online_event = threading.Event()  # Set by _on_online, wakes connect()
+        
+        # Fixed topic/QoS for fast_publish (see configure_fast_publish)
+        self._fast_topic = f"vehicle/{self.thing_name}/telemetry"
+        self._fast_qos = 1
     
     def _on_online(self):
         """Callback when client comes online"""
         print("[MQTT] Connected to AWS IoT Core")
+        self._enable_tcp_nodelay()
         self.is_connected = True
+        self._online_event.set()
     
     def _on_offline(self):
         """Callback when client goes offline"""
         print("[MQTT] Disconnected from AWS IoT Core")
         self.is_connected = False
+        self._online_event.clear()
+    
+    def _enable_tcp_nodelay(self):
+        """
+        Disable Nagle's algorithm on the MQTT socket
+        
+        Publishes are small, so letting the kernel hold them back to coalesce
+        with later writes only adds latency to each QoS 1 round-trip. The SDK
+        doesn't expose the socket, so this reaches into its paho client and
+        is skipped if that layout ever changes.
+        """
+        try:
+            sock = self.mqtt_client._mqtt_core._internal_async_client._paho_client._sock
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (AttributeError, OSError) as e:
+            print(f"[MQTT] Could not set TCP_NODELAY: {e}")
     
     def connect(self) -> bool:
         """
@@ -87,12 +120,10 @@ class CANGatewayMQTTClient:
             print(f"[MQTT] Connecting to {self.endpoint}...")
             self.mqtt_client.connect()
 
-            # Give callbacks time to fire and connection to stabilize
-            for i in range(20):  # Try for up to 10 seconds
-                time.sleep(0.5)
-                if self.is_connected:
-                    print("[MQTT] Connection confirmed via callback!")
-                    return True
+            # Wait for the online callback (returns as soon as it fires)
+            if self._online_event.wait(timeout=10):
+                print("[MQTT] Connection confirmed via callback!")
+                return True
 
             # Callback didn't fire - verify connection by attempting a test publish
             print("[MQTT] Callback didn't fire, verifying connection with test publish...")
@@ -102,6 +133,7 @@ class CANGatewayMQTTClient:
                 self.mqtt_client.publish(test_topic, "{}", 0)
                 print("[MQTT] Test publish succeeded - connection is active")
                 self.is_connected = True
+                self._online_event.set()
                 return True
             except Exception as pub_error:
                 print(f"[MQTT] Test publish failed - connection not established: {pub_error}")
@@ -109,8 +141,8 @@ class CANGatewayMQTTClient:
 
         except Exception as e:
             print(f"[ERROR] Connection failed: {e}")
-            import traceback
-            traceback.print_exc()
+            if _DEBUG:
+                traceback.print_exc()
             return False
     
     def subscribe(self, topic: str, callback) -> bool:
@@ -142,17 +174,63 @@ class CANGatewayMQTTClient:
             payload: Dict to serialize to JSON
             qos: Quality of Service (0, 1)
         
+        Returns:
+            True if successful
+        """
+        return self.publish_bytes(topic, orjson.dumps(payload), qos)
+    
+    def publish_bytes(self, topic: str, message: bytes, qos: int = 1) -> bool:
+        """
+        Publish an already-serialized message to MQTT topic
+        
+        Args:
+            topic: Topic path (e.g., "vehicle/can-gateway/telemetry")
+            message: JSON payload, already encoded to bytes
+            qos: Quality of Service (0, 1)
+        
         Returns:
             True if successful
         """
         try:
-            message = json.dumps(payload)
-            self.mqtt_client.publish(topic, message, qos)
+            # The SDK's bundled paho takes str/bytearray payloads, not bytes
+            self.mqtt_client.publish(topic, bytearray(message), qos)
             return True
         except Exception as e:
             print(f"[ERROR] Publish failed on {topic}: {e}")
             return False
     
+    def configure_fast_publish(self, topic: str, qos: int = 1):
+        """
+        Set the fixed topic and QoS used by fast_publish
+        
+        Args:
+            topic: Topic for the hot, fixed-shape stream (e.g. scheduled telemetry)
+            qos: Quality of Service (0, 1)
+        """
+        self._fast_topic = topic
+        self._fast_qos = qos
+    
+    def fast_publish(self, message: bytearray) -> bool:
+        """
+        Publish a pre-encoded message to the topic set by configure_fast_publish
+        
+        Concept: No serialization or payload conversion, and the publish is
+        handed to the SDK asynchronously instead of blocking until the
+        PUBACK arrives. The SDK still handles retries and offline queueing.
+        
+        Args:
+            message: JSON payload as a bytearray (passed to paho as-is)
+        
+        Returns:
+            True if the publish was accepted by the client
+        """
+        try:
+            self.mqtt_client.publishAsync(self._fast_topic, message, self._fast_qos)
+            return True
+        except Exception as e:
+            print(f"[ERROR] Publish failed on {self._fast_topic}: {e}")
+            return False
+    
     def disconnect(self):
         """Gracefully disconnect from AWS IoT Core"""
         try:
@@ -193,7 +271,7 @@ if __name__ == '__main__':
     
     if not client.connect():
         print("[ERROR] Failed to connect")
-        exit(1)
+        sys.exit(1)
     
     # Subscribe to command topic (must match policy)
     client.subscribe('vehicle/can-gateway/commands', message_callback)
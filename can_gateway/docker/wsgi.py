@@ -0,0 +1,14 @@
+"""
+WSGI entry point for running the gateway under gunicorn
+
+Run with a single worker process (one MQTT connection per client ID) and
+a thread pool for concurrent requests:
+  gunicorn --bind 0.0.0.0:5000 --workers 1 --worker-class gthread --threads 64 wsgi:app
+"""
+
+import atexit
+
+from app import create_app, shutdown
+
+app = create_app()
+atexit.register(shutdown)
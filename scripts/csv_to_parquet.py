@@ -0,0 +1,68 @@
+"""
+Convert a CAN capture CSV to Parquet
+
+Concept: Parse the text once, then let every later run read the compact
+columnar file instead. Columns are kept as strings exactly as they appear
+in the CSV, so the processor still runs the full input validation on them
+(TS-003) - the Parquet file only saves the text parsing, it is never
+trusted as pre-validated.
+
+The processor picks up data/<name>.parquet automatically when it is at
+least as new as data/<name>.csv, or it can be passed the .parquet directly.
+
+Usage:
+    python scripts/csv_to_parquet.py data/sample_can_data.csv [output.parquet]
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+
+def convert(csv_path: Path, parquet_path: Path) -> int:
+    """
+    Write csv_path as a zstd-compressed Parquet file
+
+    Returns:
+        Number of rows written
+    """
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        header = next(csv.reader(f), [])
+
+    # Read every column as a non-null string (same as the processor's CSV reader)
+    table = pv.read_csv(
+        csv_path,
+        convert_options=pv.ConvertOptions(
+            column_types={name: pa.string() for name in header},
+            strings_can_be_null=False
+        )
+    )
+    pq.write_table(table, parquet_path, compression='zstd')
+    return table.num_rows
+
+
+def main():
+    """Main entry point"""
+    if len(sys.argv) < 2:
+        print("❌ Usage: python scripts/csv_to_parquet.py <input_csv_file> [output_parquet_file]")
+        sys.exit(1)
+
+    csv_path = Path(sys.argv[1])
+    parquet_path = Path(sys.argv[2]) if len(sys.argv) >= 3 else csv_path.with_suffix('.parquet')
+
+    try:
+        rows = convert(csv_path, parquet_path)
+    except (OSError, pa.ArrowInvalid) as e:
+        print(f"❌ Conversion failed: {e}")
+        sys.exit(1)
+
+    print(f"✅ Wrote {rows} rows: {csv_path} ({csv_path.stat().st_size} bytes) → "
+          f"{parquet_path} ({parquet_path.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
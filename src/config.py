@@ -24,6 +24,7 @@ class Config:
     # Processing Configuration
     MAX_MESSAGE_SIZE: int = 20  # Max hex string length (8 bytes = 16 hex chars)
     VALID_DLC_RANGE: tuple = (0, 8)  # CAN DLC must be 0-8
+    MAX_CAN_ID: int = 0x1FFFFFFF  # 29-bit extended frame identifier
     
     # Known CAN IDs (whitelist for validation)
     VALID_CAN_IDS: set = {
@@ -38,6 +39,7 @@ class Config:
     # Security Configuration
     ENABLE_STRICT_VALIDATION: bool = True
     MAX_MESSAGES_PER_BATCH: int = 10000  # Prevent DoS from huge files
+    READ_CHUNK_SIZE: int = 10000  # CSV rows parsed and validated at a time
     
     # Logging Configuration
     LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
@@ -57,6 +59,9 @@ class Config:
         if cls.MAX_MESSAGES_PER_BATCH < 1:
             errors.append("MAX_MESSAGES_PER_BATCH must be positive")
         
+        if cls.READ_CHUNK_SIZE < 1:
+            errors.append("READ_CHUNK_SIZE must be positive")
+        
         if errors:
             print("❌ Configuration errors:")
             for error in errors:
@@ -1,7 +1,16 @@
 """Local test of CAN processor (no AWS required)"""
 
 from processor import CANMessageValidator, CANDataProcessor
-import json
+from itertools import islice
+import orjson
+import os
+import sys
+
+# Optional: python test_local.py [--quiet] <capture.csv> to test against your
+# own log (--quiet skips the upload previews, e.g. for timing runs)
+args = [arg for arg in sys.argv[1:] if arg != '--quiet']
+verbose = '--quiet' not in sys.argv
+input_file = args[0] if args else '../data/sample_can_data.csv'
 
 # Test 1: Validate individual messages
 print("Test 1: Message Validation")
@@ -48,19 +57,49 @@ print("-" * 40)
 
 # We can't test S3 upload without AWS, but we can test reading and processing
 # Create a mock processor for local testing
+def _preview_metadata(md, max_keys=20, max_list=5):
+    """Truncate long dicts/lists before printing, so the preview stays small for any log size"""
+    preview = {}
+    for key, value in islice(md.items(), max_keys):
+        if isinstance(value, list):
+            value = value[:max_list]
+        elif isinstance(value, dict):
+            value = _preview_metadata(value, max_keys, max_list)
+        preview[key] = value
+    if len(md) > max_keys:
+        preview['...'] = f"{len(md) - max_keys} more"
+    return preview
+
 class MockProcessor(CANDataProcessor):
-    def __init__(self):
+    def __init__(self, verbose=True):
         self.validator = CANMessageValidator()
+        self.verbose = verbose
         # Don't initialize S3 client
     
     def upload_to_s3(self, data):
-        print("\n📦 Would upload to S3:")
-        print(json.dumps(data['metadata'], indent=2))
+        if self.verbose:
+            print("\n📦 Would upload to S3:")
+            print(orjson.dumps(_preview_metadata(data['metadata']), option=orjson.OPT_INDENT_2).decode())
         return True
 
-processor = MockProcessor()
-messages = processor.read_can_data('../data/sample_can_data.csv')
+processor = MockProcessor(verbose)
+messages = processor.read_can_data(input_file)
 processed = processor.process_data(messages)
 processor.upload_to_s3(processed)
+processed['signals'].close()
+
+print("\n✅ Processing tests passed!\n")
+
+# Test 3: Chunked bulk replay (bounded memory for large captures)
+print("Test 3: Chunked Processing")
+print("-" * 40)
+
+# Captures over 50MB are processed on all CPU cores instead (process_parallel)
+if os.path.getsize(input_file) > 50 * 1024 * 1024:
+    chunked = processor.process_parallel(input_file)
+else:
+    chunked = processor.process_chunks(processor.read_can_data_chunked(input_file))
+processor.upload_to_s3(chunked)
+chunked['signals'].close()
 
-print("\n✅ Processing tests passed!")
\ No newline at end of file
+print("\n✅ Chunked processing tests passed!")
\ No newline at end of file
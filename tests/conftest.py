@@ -0,0 +1,6 @@
+"""Shared pytest setup - the processor modules live in src/ (run as scripts there)"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -0,0 +1,154 @@
+"""CANDataProcessor reading and processing, without S3"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from processor import CANDataProcessor, CANMessageValidator
+
+_SCRIPTS = Path(__file__).resolve().parent.parent / 'scripts'
+
+
+class LocalProcessor(CANDataProcessor):
+    """Processor without an S3 client (same idea as src/test_local.py)"""
+    
+    def __init__(self):
+        self.validator = CANMessageValidator()
+
+
+def _write_csv(path, lines):
+    path.write_text('timestamp,can_id,data,dlc,signal_name\n' + ''.join(line + '\n' for line in lines))
+    return str(path)
+
+
+def test_read_can_data_drops_extra_fields_like_dictreader(tmp_path, caplog):
+    now = f"{time.time():.3f}"
+    input_file = _write_csv(tmp_path / 'extra.csv', [
+        f"{now},0x100,0x12,1,engine_rpm",
+        f"{now},0x200,0x12,1,vehicle_speed,extra",
+        f"{now},0x300,0x12,1,coolant_temp",
+    ])
+    
+    messages = LocalProcessor().read_can_data(input_file)
+    
+    assert messages['can_id'].tolist() == [0x100, 0x200, 0x300]
+    assert messages['signal_name'].tolist()[1] == 'vehicle_speed'
+    assert 'Line 3: Ignoring 1 extra field(s)' in caplog.text
+    assert 'Invalid message' not in caplog.text
+
+
+def test_read_can_data_accepts_trailing_comma_on_every_row(tmp_path, caplog):
+    now = f"{time.time():.3f}"
+    input_file = _write_csv(tmp_path / 'trailing.csv', [f"{now},0x100,0x12,1,engine_rpm,"] * 5)
+    
+    messages = LocalProcessor().read_can_data(input_file)
+    
+    assert len(messages) == 5
+    assert 'extra field' not in caplog.text
+    assert 'Invalid message' not in caplog.text
+
+
+def test_read_can_data_rejects_duplicate_header_names(tmp_path):
+    input_file = tmp_path / 'duplicate.csv'
+    input_file.write_text(f"timestamp,can_id,data,dlc,signal_name,timestamp\n{time.time():.3f},0x100,0x12,1,rpm,1\n")
+    
+    with pytest.raises(ValueError, match='Duplicate column name.*timestamp'):
+        LocalProcessor().read_can_data(str(input_file))
+
+
+def test_process_parallel_matches_sequential_chunked_path(tmp_path):
+    now = time.time()
+    lines = []
+    for i in range(1000):
+        can_id = ('0x100', '0x200', '0x300')[i % 3]
+        lines.append(f"{now - 1000 + i * 0.5:.3f},{can_id},0x{i % 256:02x},1,signal_{i % 7}")
+        if i % 97 == 0:
+            lines.append(f"{now:.3f},NOT_HEX,0x12,1,engine_rpm")
+    input_file = _write_csv(tmp_path / 'capture.csv', lines)
+    processor = LocalProcessor()
+    
+    parallel = processor.process_parallel(input_file, workers=2, chunksize=64)
+    sequential = processor.process_chunks(processor.read_can_data_chunked(input_file, chunksize=64))
+    
+    for processed in (parallel, sequential):
+        del processed['metadata']['processing_timestamp']
+    with parallel.pop('signals') as parallel_signals, sequential.pop('signals') as sequential_signals:
+        assert pq.read_table(parallel_signals).equals(pq.read_table(sequential_signals))
+    assert parallel == sequential
+    assert parallel['metadata']['total_messages'] == 1000
+
+
+def test_process_chunks_interval_stats_match_the_full_capture(tmp_path):
+    # Irregular intervals, IDs that span many chunk boundaries, and 0x300
+    # seen exactly once
+    rng = np.random.default_rng(7)
+    now = time.time()
+    timestamps = np.round(now - 1000 + np.cumsum(rng.uniform(0.001, 2.0, 200)), 6)
+    can_ids = rng.choice(['0x100', '0x200'], size=200, p=[0.7, 0.3])
+    can_ids[100] = '0x300'
+    input_file = _write_csv(tmp_path / 'capture.csv', [
+        f"{timestamp:.6f},{can_id},0x12,1,engine_rpm" for timestamp, can_id in zip(timestamps, can_ids)
+    ])
+    processor = LocalProcessor()
+    
+    processed = processor.process_chunks(processor.read_can_data_chunked(input_file, chunksize=7))
+    processed['signals'].close()
+    
+    for can_id in ('0x100', '0x200'):
+        intervals = np.diff(timestamps[can_ids == can_id])
+        stats = processed['can_id_stats'][can_id]
+        assert stats['interval_mean'] == pytest.approx(intervals.mean(), rel=1e-9)
+        assert stats['interval_std'] == pytest.approx(intervals.std(), rel=1e-9)
+    assert processed['can_id_stats']['0x300']['interval_mean'] is None
+    assert processed['can_id_stats']['0x300']['interval_std'] is None
+
+
+def test_run_closes_the_signals_file_after_upload(tmp_path):
+    now = f"{time.time():.3f}"
+    input_file = _write_csv(tmp_path / 'capture.csv', [f"{now},0x100,0x12,1,engine_rpm"])
+    uploaded = []
+    
+    class UploadingProcessor(LocalProcessor):
+        def upload_to_s3(self, data):
+            uploaded.append(data)
+            return True
+    
+    assert UploadingProcessor().run(input_file)
+    assert uploaded[0]['signals'].closed
+
+
+def test_csv_to_parquet_keeps_columns_as_strings_after_bom(tmp_path):
+    now = f"{time.time():.3f}"
+    csv_file = tmp_path / 'bom.csv'
+    csv_file.write_text('﻿' + 'timestamp,can_id,data,dlc,signal_name\n' + f"{now},0x100,0x12,1,engine_rpm\n",
+                        encoding='utf-8')
+    parquet_file = tmp_path / 'bom.parquet'
+    
+    subprocess.run([sys.executable, str(_SCRIPTS / 'csv_to_parquet.py'), str(csv_file), str(parquet_file)], check=True)
+    
+    schema = pq.read_schema(parquet_file)
+    assert schema.names == ['timestamp', 'can_id', 'data', 'dlc', 'signal_name']
+    assert set(schema.types) == {pa.string()}
+
+
+def test_read_can_data_validates_typed_parquet_columns(tmp_path):
+    # A Parquet file not written by csv_to_parquet.py, with numeric columns
+    now = time.time()
+    parquet_file = tmp_path / 'typed.parquet'
+    pq.write_table(pa.table({
+        'timestamp': [now, now, -1.0],
+        'can_id': ['0x100', '0x200', '0x300'],
+        'data': ['0x12', '0x34', '0x56'],
+        'dlc': [1, 9, 1],
+        'signal_name': ['engine_rpm', 'vehicle_speed', 'coolant_temp'],
+    }), parquet_file)
+    
+    messages = LocalProcessor().read_can_data(str(parquet_file))
+    
+    assert messages['can_id'].tolist() == [0x100]
@@ -0,0 +1,114 @@
+"""
+Vectorized validation (validate_frame) against the per-row validator
+
+Concept: validate_frame is allowed to be conservative - rows it rejects are
+re-checked with validate_message - but it must never accept a row that
+validate_message rejects (TS-003).
+"""
+
+import pickle
+import random
+import time
+
+import pandas as pd
+import pytest
+
+from config import Config
+from processor import CANMessageValidator
+
+_NOW = time.time()
+
+# Seed values per field, valid and invalid, mutated further by _fuzz_value
+_SEEDS = {
+    'timestamp': [f"{_NOW:.3f}", f"{_NOW:.0f}", f" {_NOW:.3f} ", f"{_NOW - 4e7:.3f}", '-1', '1e9',
+                  'nan', 'inf', 'abc', '', f"{_NOW:.3f}\x00garbage", f"{_NOW:.0f}_0"],
+    'can_id': ['0x100', '0X200', '0x0300', '0x999', '0x1fffffff', '0x20000000', '0x0x100',
+               'NOT_HEX', '0x', 'x100', '0x100 ', '+0x100', '0x1_00', ''],
+    'data': ['0x12', '0xABCDEF0123456789', '0x' + 'A' * 100, '0x', '0xZZ', '0x0x12',
+             '0x 12', '0x1_2', '0x' + '0' * 18, '0x' + '0' * 19, ''],
+    'dlc': ['8', '0', '08', '008', '9', '-1', '+8', ' 8', '8.0', '8\x00', ''],
+    'signal_name': ['engine_rpm', 'vehicle_speed', 'drop table', 'a<b', ''],
+}
+
+_VALID_ROW = {'timestamp': f"{_NOW:.3f}", 'can_id': '0x100', 'data': '0x12', 'dlc': '1',
+              'signal_name': 'engine_rpm'}
+
+# Characters the parsers disagree about most: separators, signs, NULs,
+# whitespace and non-ASCII digits
+_ALPHABET = '0123456789abcdefABCDEFxX.+-e_ \t\n\x00\xa0\xff٠٨'
+
+
+def _fuzz_value(rng: random.Random, seeds) -> str:
+    """A seed value, possibly with one character inserted, replaced or removed"""
+    value = rng.choice(seeds)
+    if not value or rng.random() < 0.5:
+        return value
+    position = rng.randrange(len(value) + 1)
+    edit = rng.randrange(3)
+    if edit == 0:
+        return value[:position] + rng.choice(_ALPHABET) + value[position:]
+    if edit == 1:
+        return value[:position] + rng.choice(_ALPHABET) + value[position + 1:]
+    return value[:position] + value[position + 1:]
+
+
+@pytest.mark.parametrize('strict', [True, False])
+def test_frame_never_accepts_a_row_the_scalar_validator_rejects(strict, monkeypatch):
+    monkeypatch.setattr(Config, 'ENABLE_STRICT_VALIDATION', strict)
+    rng = random.Random(2024)
+    # Start from a valid row and fuzz some of its fields, so most rows are
+    # near-valid (where the two validators can disagree)
+    rows = [
+        {field: _fuzz_value(rng, _SEEDS[field]) if rng.random() < 0.3 else value
+         for field, value in _VALID_ROW.items()}
+        for _ in range(25000)
+    ]
+    
+    validator = CANMessageValidator()
+    accepted = validator.validate_frame(pd.DataFrame(rows))
+    
+    wrongly_accepted = [row for row, ok in zip(rows, accepted) if ok and not validator.validate_message(row)[0]]
+    assert wrongly_accepted == []
+
+
+def test_frame_rejects_timestamp_with_embedded_nul():
+    # pandas stops parsing at the NUL, float() rejects the whole string
+    row = dict(_VALID_ROW, timestamp=f"{_NOW:.3f}\x00garbage")
+    
+    validator = CANMessageValidator()
+    assert not validator.validate_message(row)[0]
+    assert not validator.validate_frame(pd.DataFrame([row])).iloc[0]
+
+
+@pytest.mark.parametrize('field, value', [('can_id', '0x0x100'), ('data', '0x0x12'), ('can_id', '0X0X100')])
+def test_message_rejects_doubled_hex_prefix(field, value):
+    # int(digits, 16) alone would accept the second '0x'
+    row = dict(_VALID_ROW, **{field: value})
+    assert not CANMessageValidator().validate_message(row)[0]
+
+
+def test_frame_and_message_use_the_config_at_construction(monkeypatch):
+    monkeypatch.setattr(Config, 'ENABLE_STRICT_VALIDATION', False)
+    validator = CANMessageValidator()
+    monkeypatch.setattr(Config, 'ENABLE_STRICT_VALIDATION', True)
+    # Not in the whitelist, so only a non-strict validator accepts it
+    row = dict(_VALID_ROW, can_id='0x999')
+    
+    assert validator.validate_message(row)[0]
+    assert validator.validate_frame(pd.DataFrame([row])).iloc[0]
+    
+    restored = pickle.loads(pickle.dumps(validator))
+    assert restored.validate_message(row)[0]
+    assert restored.validate_frame(pd.DataFrame([row])).iloc[0]
+
+
+def test_frame_and_message_use_the_whitelist_at_construction(monkeypatch):
+    monkeypatch.setattr(Config, 'ENABLE_STRICT_VALIDATION', True)
+    monkeypatch.setattr(Config, 'VALID_CAN_IDS', Config.VALID_CAN_IDS | {'0x555', '0x1abcdef'})
+    validator = CANMessageValidator()
+    monkeypatch.setattr(Config, 'VALID_CAN_IDS', set())
+    rows = [dict(_VALID_ROW, can_id='0x555'), dict(_VALID_ROW, can_id='0x1abcdef')]
+    
+    for candidate in (validator, pickle.loads(pickle.dumps(validator))):
+        assert all(candidate.validate_message(row)[0] for row in rows)
+        assert candidate.validate_frame(pd.DataFrame(rows)).all()